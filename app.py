@@ -44,6 +44,34 @@ import pprint
 from sgtk import TankError
 from sgtk.platform import Application
 
+# the Flame sequence token in a resolved path, e.g. "[1001-1100]" in "plate.[1001-1100].dpx"
+FLAME_SEQUENCE_TOKEN_REGEX = re.compile(r".*(\[[0-9]+-[0-9]+\])\.")
+
+
+def _get_flame_sequence_token(path):
+    """
+    Extracts the Flame sequence token from a resolved path.
+
+    The token almost always sits right before the file extension, so it is
+    looked up with plain string searches first; the regular expression is
+    only used when that fails.
+
+    :param path: Resolved path, e.g. "plate.[1001-1100].dpx"
+    :returns: The sequence token, e.g. "[1001-1100]", or None if not found
+    """
+    end = path.rfind("].")
+    if end != -1:
+        start = path.rfind("[", 0, end)
+        if start != -1:
+            (first, sep, last) = path[start + 1 : end].partition("-")
+            if sep and first.isdigit() and last.isdigit():
+                return path[start : end + 1]
+
+    re_match = FLAME_SEQUENCE_TOKEN_REGEX.search(path)
+    if re_match:
+        return re_match.group(1)
+    return None
+
 
 class FlameExport(Application):
     """
@@ -62,12 +90,15 @@ class FlameExport(Application):
         # sequences that are being exported
         self._sequences = []
 
+        # task templates looked up during an export session, keyed by name
+        self._task_template_cache = {}
+
         # create a submit helper
         # because parts of this app runs on the farm, which doesn't have a UI,
         # there are two distinct modules on disk, one which is QT dependent and
         # one which isn't.
-        export_utils = self.import_module("export_utils")
-        self._sg_submit_helper = export_utils.ShotgunSubmitter()
+        self._export_utils = self.import_module("export_utils")
+        self._sg_submit_helper = self._export_utils.ShotgunSubmitter()
 
         # batch render tracking - when doing a batch render,
         # this is used to indicate that the user wants to send the render to review.
@@ -77,12 +108,49 @@ class FlameExport(Application):
         self._user_comments = ""
         self._export_preset = None
 
+        # time fields shared by all assets of an export session
+        self._export_time_fields = {}
+
+        # host name to export to. It can't change while the app is running,
+        # so it is resolved the first time an export starts.
+        self._server_hostname = None
+
+        # length of the export root prefix (including the trailing separator)
+        # which is chopped off the resolved paths handed back to Flame
+        self._destination_path_prefix_length = 0
+
         # flag to indicate that something was actually submitted by the export process
         self._reached_post_asset_phase = False
 
+        # UI modules, imported on first use. See the _qt_gui and _dialogs properties.
+        self.__qt_gui = None
+        self.__dialogs = None
+
         # load up our export presets
         # this wrapper class is used later on to access export presets in various ways
-        self.export_preset_handler = export_utils.ExportPresetHandler()
+        self.export_preset_handler = self._export_utils.ExportPresetHandler()
+
+        # resolve the templates used for every exported asset up front
+        self._batch_template = self.get_template("batch_template")
+        self._shot_clip_template = self.get_template("shot_clip_template")
+        self._segment_clip_template = self.get_template("segment_clip_template")
+
+        # templates to resolve exported assets with, keyed by Flame asset type.
+        # the video templates depend on the export preset and are added
+        # once the user has picked one in pre_custom_export
+        self._templates_by_asset_type = {
+            "batch": self._batch_template,
+            "batchOpenClip": self._shot_clip_template,
+            "openClip": self._segment_clip_template,
+        }
+
+        # methods recording exported assets in post_export_asset, keyed by Flame asset type.
+        # other asset types aren't tracked.
+        self._exported_asset_handlers = {
+            "video": self._track_exported_render,
+            "movie": self._track_exported_render,
+            "batch": self._track_exported_batch,
+        }
 
         # register our desired interaction with Flame hooks
         # set up callbacks for the engine to trigger
@@ -102,6 +170,40 @@ class FlameExport(Application):
         batch_callbacks["batchExportBegin"] = self.pre_batch_render_checks
         self.engine.register_batch_hook(batch_callbacks)
 
+    @property
+    def _qt_gui(self):
+        """
+        The QtGui module, imported the first time a hook needs to show UI.
+
+        Parts of this app run on the farm without QT, so the import cannot
+        happen when the app is loaded.
+        """
+        if self.__qt_gui is None:
+            from sgtk.platform.qt import QtGui
+
+            self.__qt_gui = QtGui
+        return self.__qt_gui
+
+    @property
+    def _dialogs(self):
+        """
+        The app's dialogs module, imported the first time a hook needs to show UI.
+        """
+        if self.__dialogs is None:
+            self.__dialogs = self.import_module("dialogs")
+        return self.__dialogs
+
+    @property
+    def debug_enabled(self):
+        """
+        True if Toolkit debug logging is turned on.
+
+        Toolkit filters debug messages in its log handlers rather than on
+        the logger, so this is what tells if a debug message that is
+        expensive to format will actually be written anywhere.
+        """
+        return sgtk.LogManager().global_debug
+
     def _abort_export(self, info, message):
         info["abort"] = True
         info["abortMessage"] = message
@@ -123,23 +225,20 @@ class FlameExport(Application):
                      - abort: Pass True back to Flame if you want to abort
                      - abortMessage: Abort message to feed back to client
         """
-        from sgtk.platform.qt import QtGui
-
         # reset export session data
         self._sequences = []
+        self._task_template_cache = {}
         self._reached_post_asset_phase = False
 
         # pop up a UI asking the user for description
-        dialogs = self.import_module("dialogs")
-
         (return_code, widget) = self.engine.show_modal(
             "Export Shots",
             self,
-            dialogs.SubmitDialog,
+            self._dialogs.SubmitDialog,
             self.export_preset_handler.get_preset_names(),
         )
 
-        if return_code == QtGui.QDialog.Rejected:
+        if return_code == self._qt_gui.QDialog.Rejected:
             # user pressed cancel
             self._abort_export(info, "User cancelled the operation.")
 
@@ -152,12 +251,30 @@ class FlameExport(Application):
             self._export_preset = self.export_preset_handler.get_preset_by_name(
                 export_preset_name
             )
+            render_template = self._export_preset.get_render_template()
+            self._templates_by_asset_type["video"] = render_template
+            self._templates_by_asset_type["movie"] = render_template
+
+            # snapshot the time once so that all assets of this export
+            # resolve to the same date and time based paths
+            now = datetime.datetime.now()
+            self._export_time_fields = {
+                "YYYY": now.year,
+                "MM": now.month,
+                "DD": now.day,
+                "hh": now.hour,
+                "mm": now.minute,
+                "ss": now.second,
+            }
 
             # populate the host to use for the export. Currently hard coded to local
-            info["destinationHost"] = self.engine.get_server_hostname()
+            if self._server_hostname is None:
+                self._server_hostname = self.engine.get_server_hostname()
+            info["destinationHost"] = self._server_hostname
 
             # let the export root path align with the primary project root
             info["destinationPath"] = self.sgtk.project_path
+            self._destination_path_prefix_length = len(info["destinationPath"]) + 1
 
             # pick up the xml export profile from the configuration
             info["presetPath"] = self._export_preset.get_xml_path()
@@ -190,15 +307,11 @@ class FlameExport(Application):
                      - abortMessage: Error message to be displayed to the user when the export sequence
                        process has been aborted.
         """
-        from sgtk.platform.qt import QtGui
-
-        export_utils = self.import_module("export_utils")
-
         sequence_name = info["sequenceName"]
         shot_names = info["shotNames"]
 
         if len(shot_names) == 0:
-            QtGui.QMessageBox.warning(
+            self._qt_gui.QMessageBox.warning(
                 None,
                 "Please name your shots!",
                 "The Flow Production Tracking integration requires you to name your shots. Please go back to "
@@ -210,7 +323,7 @@ class FlameExport(Application):
 
         # @TODO - add more generic validation
         if " " in sequence_name:
-            QtGui.QMessageBox.warning(
+            self._qt_gui.QMessageBox.warning(
                 None,
                 "Sequence name cannot contain spaces!",
                 "Your Sequence name contains spaces. This is currently not supported by "
@@ -221,12 +334,12 @@ class FlameExport(Application):
             return
 
         # set up object to represent sequence and shots
-        sequence = export_utils.Sequence(sequence_name)
+        sequence = self._export_utils.Sequence(sequence_name)
         for shot_name in shot_names:
             sequence.add_shot(shot_name)
 
         # create entities in Flow Production Tracking, create folders on disk and compute shot contexts.
-        sequence.process_shotgun_shot_structure()
+        sequence.process_shotgun_shot_structure(self._task_template_cache)
         self._sequences.append(sequence)
 
     def pre_export_asset(self, session_id, info):
@@ -286,7 +399,8 @@ class FlameExport(Application):
             self.log_error("Skipping unknown sequence %s" % sequence_name)
             return
 
-        if asset_type not in ["video", "movie", "batch", "batchOpenClip", "openClip"]:
+        template = self._templates_by_asset_type.get(asset_type)
+        if template is None:
             # the review system ignores any other assets. The export profiles are defined
             # in the app's settings hook, so technically there shouldn't be any other items
             # generated - but just in case there are (because of customizations), we'll simply
@@ -295,9 +409,7 @@ class FlameExport(Application):
 
         # check that the clip has a shot name - otherwise things won't work!
         if shot_name == "":
-            from sgtk.platform.qt import QtGui
-
-            QtGui.QMessageBox.warning(
+            self._qt_gui.QMessageBox.warning(
                 None,
                 "Missing shot name!",
                 (
@@ -317,59 +429,33 @@ class FlameExport(Application):
         # prepare for export of asset
         shot = sequence.get_shot(shot_name)
 
-        if asset_type in ["video", "movie"]:
-            # resolve template for exported plates or video
-            template = self._export_preset.get_render_template()
-
-        elif asset_type == "batch":
-            # resolve template for batch file
-            template = self.get_template("batch_template")
-
-        elif asset_type == "batchOpenClip":
-            # resolve template for shot level open scene clip xml
-            template = self.get_template("shot_clip_template")
-
-        elif asset_type == "openClip":
-            # resolve template for segment level open scene clip xml
-            template = self.get_template("segment_clip_template")
-
-        self.log_debug("Attempting to resolve template %s..." % template)
-
         # resolve the fields out of the context
-        self.log_debug(
-            "Resolving template %s using context %s" % (template, shot.context)
-        )
-        fields = shot.context.as_template_fields(template)
-        self.log_debug("Resolved context based fields: %s" % fields)
+        fields = shot.get_template_fields(template)
 
         if asset_type == "video":
             # handle the Flame sequence token - it will come in as "[1001-1100]"
-            re_match = re.search(".*(\[[0-9]+-[0-9]+\])\..*", info["resolvedPath"])
-            if re_match:
-                frames = re_match.group(1)
+            frames = _get_flame_sequence_token(info["resolvedPath"])
+            if frames:
                 fields["SEQ"] = frames
                 fields["flame.frame"] = frames
 
         # create some fields based on the info in the info params
-        if "versionNumber" in info:
-            fields["version"] = int(info["versionNumber"])
+        version_number = info.get("versionNumber")
+        if version_number is not None:
+            fields["version"] = int(version_number)
 
         fields["segment_name"] = asset_name
 
-        if "width" in info:
-            fields["width"] = int(info["width"])
+        width = info.get("width")
+        if width is not None:
+            fields["width"] = int(width)
 
-        if "height" in info:
-            fields["height"] = int(info["height"])
+        height = info.get("height")
+        if height is not None:
+            fields["height"] = int(height)
 
         # populate the time field metadata
-        now = datetime.datetime.now()
-        fields["YYYY"] = now.year
-        fields["MM"] = now.month
-        fields["DD"] = now.day
-        fields["hh"] = now.hour
-        fields["mm"] = now.minute
-        fields["ss"] = now.second
+        fields.update(self._export_time_fields)
 
         try:
             full_path = template.apply_fields(fields)
@@ -379,12 +465,17 @@ class FlameExport(Application):
                 "from template %s and fields %s: %s" % (template, fields, e)
             )
 
-        self.log_debug("Resolved %s -> %s" % (fields, full_path))
-
         # chop off the root of the path - the resolvedPath should be local to the destinationPath
-        local_path = full_path[len(info["destinationPath"]) + 1 :]
+        local_path = full_path[self._destination_path_prefix_length :]
 
-        self.log_debug("Chopping off root path %s -> %s" % (full_path, local_path))
+        # this hook runs for every exported asset, so only build the
+        # debug message if it is actually going to be logged
+        if self.debug_enabled:
+            self.log_debug(
+                "Resolved template %s using context %s and fields %s -> %s "
+                "(local path %s)"
+                % (template, shot.context, fields, full_path, local_path)
+            )
 
         # pass an updated path back to the Flame. This ensures that all the
         # character substitutions etc are handled according to the toolkit logic
@@ -431,40 +522,47 @@ class FlameExport(Application):
            versionName:     Current version name of export (Empty if unversioned).
            versionNumber:   Current version number of export (0 if unversioned).
         """
-        asset_type = info["assetType"]
-        segment_name = info["assetName"]
-        shot_name = info["shotName"]
-        sequence_name = info["sequenceName"]
-
-        if asset_type not in ["video", "movie", "batch"]:
+        handler = self._exported_asset_handlers.get(info["assetType"])
+        if handler is None:
             # ignore anything that isn't video or batch
             return
 
         # resolve shot object
-        shot = self._sequences[-1].get_shot(shot_name)
+        shot = self._sequences[-1].get_shot(info["shotName"])
+        handler(shot, info)
 
-        if asset_type in ["video", "movie"]:
-            # create a new segment for the shot
-            segment = shot.add_segment(segment_name)
+        # indicate that the export has reached its last stage
+        self._reached_post_asset_phase = True
 
-            # note: not all versions of Flame pass a handle parameter
-            # so add the preset default in case value isn't passed.
-            if "handleIn" not in info:
-                info["handleIn"] = self._export_preset.get_handles_length()
+    def _track_exported_render(self, shot, info):
+        """
+        Records a render exported for a segment of the given shot.
 
-            if "handleOut" not in info:
-                info["handleOut"] = self._export_preset.get_handles_length()
+        :param shot: Shot object the render belongs to.
+        :param info: Flame hook data dictionary for the exported asset.
+        """
+        # create a new segment for the shot
+        segment = shot.add_segment(info["assetName"])
 
-            # pass in raw data from flame
-            segment.set_flame_data(info)
+        # note: not all versions of Flame pass a handle parameter
+        # so add the preset default in case value isn't passed.
+        handles_length = self._export_preset.get_handles_length()
+        info.setdefault("handleIn", handles_length)
+        info.setdefault("handleOut", handles_length)
 
-        elif asset_type == "batch":
-            # this is a batch export. These are per *shot*, even in the case of a shot
-            # with multiple clips, only one batch file gets output.
-            shot.set_flame_batch_data(info)
+        # pass in raw data from flame
+        segment.set_flame_data(info)
 
-        # indicate that the export has reached its last stage
-        self._reached_post_asset_phase = True
+    def _track_exported_batch(self, shot, info):
+        """
+        Records a batch file exported for the given shot.
+
+        :param shot: Shot object the batch file belongs to.
+        :param info: Flame hook data dictionary for the exported asset.
+        """
+        # this is a batch export. These are per *shot*, even in the case of a shot
+        # with multiple clips, only one batch file gets output.
+        shot.set_flame_batch_data(info)
 
     def do_submission_and_summary(self, session_id, info):
         """
@@ -480,8 +578,6 @@ class FlameExport(Application):
                      - destinationPath: Export path root.
                      - presetPath: Path to the preset used for the export.
         """
-        dialogs = self.import_module("dialogs")
-
         # if we haven't reached the post export stage, that means that something
         # has gone wrong along the way. Display the "oops, something went wrong"
         # dialog.
@@ -489,20 +585,30 @@ class FlameExport(Application):
             self.engine.show_modal(
                 "Submission Failed",
                 self,
-                dialogs.SubmissionFailedDialog,
+                self._dialogs.SubmissionFailedDialog,
                 self.engine.log_file,
             )
             return
 
+        # the export preset settings are the same for every shot and segment
+        export_preset_name = self._export_preset.get_name()
+        upload_quicktime = self._export_preset.upload_quicktime()
+        cut_type = self._export_preset.get_cut_type()
+        highres_quicktime_enabled = self._export_preset.highres_quicktime_enabled()
+        quicktime_path_from_render_path = (
+            self._export_preset.quicktime_path_from_render_path
+        )
+
         num_cut_changes = 0
         num_created_shots = 0
         # figure out which shots are new
         for sequence in self._sequences:
-            created_shots = [shot for shot in sequence.shots if shot.new_in_shotgun]
-            num_created_shots += len(created_shots)
+            num_created_shots += sum(
+                1 for shot in sequence.shots if shot.new_in_shotgun
+            )
 
             # push shot cut changes and version records to Flow Production Tracking
-            # as a single batch call
+            # using batch calls
             shotgun_batch_items = []
             version_path_lookup = {}
 
@@ -510,38 +616,47 @@ class FlameExport(Application):
             shotgun_batch_items += sequence.compute_shot_cut_changes()
             num_cut_changes += len(shotgun_batch_items)
 
+            # collect the segments to process as a flat list of (shot, segment) pairs.
+            # it is possible that the user has manually cancelled the process, so
+            # it's possible that a segment doesn't have a video export associated
+            # this can happen if for example a user chooses not to overwrite an
+            # existing file on disk.
+            rendered_segments = [
+                (shot, segment)
+                for shot in sequence.shots
+                for segment in shot.segments
+                if segment.has_render_export
+            ]
+
             # create versions for all segments
             self.log_debug("Looping over all shots and segments to submit versions...")
-            for shot in sequence.shots:
-                for segment in shot.segments:
-
-                    # it is possible that the user has manually cancelled the process, so
-                    # it's possible that a segment doesn't have a video export associated
-                    # this can happen if for example a user chooses not to overwrite an
-                    # existing file on disk.
-                    if segment.has_render_export:
-
-                        # compute a version-create Flow Production Tracking batch dictionary
-                        sg_version_batch = self._sg_submit_helper.create_version_batch(
-                            shot.context,
-                            segment.render_path,
-                            self._user_comments,
-                            None,
-                            segment.render_aspect_ratio,
-                        )
-                        # append to our main batch listing
-                        self.log_debug(
-                            "Registering version: %s" % pprint.pformat(sg_version_batch)
-                        )
-                        shotgun_batch_items.append(sg_version_batch)
+            create_version_batch = self._sg_submit_helper.create_version_batch
+            user_comments = self._user_comments
+            debug_enabled = self.debug_enabled
+            for (shot, segment) in rendered_segments:
+
+                # compute a version-create Flow Production Tracking batch dictionary
+                sg_version_batch = create_version_batch(
+                    shot.context,
+                    segment.render_path,
+                    user_comments,
+                    None,
+                    segment.render_aspect_ratio,
+                )
+                # append to our main batch listing
+                if debug_enabled:
+                    self.log_debug(
+                        "Registering version: %s" % pprint.pformat(sg_version_batch)
+                    )
+                shotgun_batch_items.append(sg_version_batch)
 
-                        # once the batch has been executed and the versions have been created in Flow Production Tracking
-                        # we need to update our segment metadata with the Flow Production Tracking version id.
-                        # in order to do that, maintain a lookup dictionary:
-                        path_to_frames = sg_version_batch["data"]["sg_path_to_frames"]
-                        version_path_lookup[path_to_frames] = segment
+                # once the batch has been executed and the versions have been created in Flow Production Tracking
+                # we need to update our segment metadata with the Flow Production Tracking version id.
+                # in order to do that, maintain a lookup dictionary:
+                path_to_frames = sg_version_batch["data"]["sg_path_to_frames"]
+                version_path_lookup[path_to_frames] = segment
 
-            # push all new versions and cut changes to Flow Production Tracking in a single batch call.
+            # push all new versions and cut changes to Flow Production Tracking using chunked batch calls.
             sg_data = []
             if len(shotgun_batch_items) > 0:
                 self.engine.show_busy(
@@ -553,7 +668,7 @@ class FlameExport(Application):
                         "Pushing %s Flow Production Tracking batch items..."
                         % len(shotgun_batch_items)
                     )
-                    sg_data = self.shotgun.batch(shotgun_batch_items)
+                    sg_data = self._export_utils.batch(shotgun_batch_items)
                     self.log_debug("...done")
                 finally:
                     # kill progress indicator
@@ -564,11 +679,20 @@ class FlameExport(Application):
                 if sg_entity["type"] == "Version":
                     # using our lookup table, find the metadata object
                     segment = version_path_lookup[sg_entity["sg_path_to_frames"]]
-                    segment.set_shotgun_version_id(sg_entity["id"])
+                    sequence.set_segment_version_id(segment, sg_entity["id"])
 
             # now that we have resolved all cut changes and created versions,
             # request the creation of a new cut in Flow Production Tracking
-            sequence.create_cut(self._export_preset.get_cut_type())
+            sequence.create_cut(cut_type)
+
+            if not rendered_segments and not any(
+                shot.has_batch_export for shot in sequence.shots
+            ):
+                # nothing was exported for this sequence, for example because the
+                # user chose not to overwrite existing files, so there is nothing
+                # to publish and no thumbnail or quicktime jobs to submit.
+                self.log_debug("Nothing to publish for %s." % sequence)
+                continue
 
             # Now submit a series of backburner jobs to handle the rest of the processing.
 
@@ -606,7 +730,7 @@ class FlameExport(Application):
                                     % (shot.name, segment.name),
                                 )
                                 sg_data = self._sg_submit_helper.register_video_publish(
-                                    self._export_preset.get_name(),
+                                    export_preset_name,
                                     shot.context,
                                     segment.render_width,
                                     segment.render_height,
@@ -645,7 +769,7 @@ class FlameExport(Application):
                                     dependencies=dependencies,
                                     target_entities=target_entities,
                                     asset_info=segment.flame_data,
-                                    favor_preview=self._export_preset.upload_quicktime(),
+                                    favor_preview=upload_quicktime,
                                 )
                 finally:
                     # The thumbnail generator will bundle request for same paths to
@@ -663,7 +787,7 @@ class FlameExport(Application):
             # Each item will be processed in a separate backburner job.
             # note that this happens in a separate loop after the upload quicktime loop
             # to ensure that these tasks happen last.
-            if self._export_preset.highres_quicktime_enabled():
+            if highres_quicktime_enabled:
                 try:
                     self.engine.show_busy(
                         "Updating Flow Production Tracking...",
@@ -672,75 +796,70 @@ class FlameExport(Application):
                     self.log_debug(
                         "Looping over all shots and segments to generate high-res quicktimes..."
                     )
-                    for shot in sequence.shots:
-                        for segment in shot.segments:
-                            if segment.has_shotgun_version:
+                    for segment in sequence.versioned_segments:
 
-                                # compute quicktime path from frames
-                                quicktime_path = (
-                                    self._export_preset.quicktime_path_from_render_path(
-                                        segment.render_path
-                                    )
-                                )
-
-                                # if the video media is generated in a backburner job, make sure that
-                                # our quicktime job is executed *after* this job has finished
-                                dependencies = segment.backburner_job_id
-
-                                args = {
-                                    "export_preset_name": self._export_preset.get_name(),
-                                    "version_id": segment.shotgun_version_id,
-                                    "path": segment.render_path,
-                                    "quicktime_path": quicktime_path,
-                                    "width": segment.render_width,
-                                    "height": segment.render_height,
-                                    "fps": segment.fps,
-                                }
-
-                                target_entities = [
-                                    {
-                                        "type": "Version",
-                                        "id": segment.shotgun_version_id,
-                                    }
-                                ]
+                        # compute quicktime path from frames
+                        quicktime_path = quicktime_path_from_render_path(
+                            segment.render_path
+                        )
 
-                                # Generate a movie file that will not be uploaded to
-                                # Flow Production Tracking server but instead will be linked using the
-                                # Path to Movie field.
-                                #
-                                self.engine.local_movie_generator.generate(
-                                    src_path=segment.render_path,
-                                    dst_path=quicktime_path,
-                                    display_name=segment.name,
-                                    target_entities=target_entities,
-                                    asset_info=segment.flame_data,
-                                    dependencies=dependencies,
-                                )
+                        # if the video media is generated in a backburner job, make sure that
+                        # our quicktime job is executed *after* this job has finished
+                        dependencies = segment.backburner_job_id
+
+                        target_entities = [
+                            {
+                                "type": "Version",
+                                "id": segment.shotgun_version_id,
+                            }
+                        ]
+
+                        # Generate a movie file that will not be uploaded to
+                        # Flow Production Tracking server but instead will be linked using the
+                        # Path to Movie field.
+                        #
+                        self.engine.local_movie_generator.generate(
+                            src_path=segment.render_path,
+                            dst_path=quicktime_path,
+                            display_name=segment.name,
+                            target_entities=target_entities,
+                            asset_info=segment.flame_data,
+                            dependencies=dependencies,
+                        )
                 finally:
                     self.engine.clear_busy()
 
         # now, as a last step, show a summary UI to the user, including a
         # very brief overview of what changes have been carried out.
-        comments = "Your export has been pushed to the Backburner queue for processing.<br><br>"
-
-        if num_created_shots == 1:
-            comments += "- A new Shot was created in Flow Production Tracking. <br>"
-        elif num_created_shots > 1:
-            comments += (
-                "- %d new Shots were created in Flow Production Tracking. <br>"
-                % num_created_shots
-            )
+        # each summary item is a count with its singular and plural message.
+        # Items with a zero count are left out of the summary.
+        summary_items = (
+            (
+                num_created_shots,
+                "- A new Shot was created in Flow Production Tracking. <br>",
+                "- %d new Shots were created in Flow Production Tracking. <br>",
+            ),
+            (
+                num_cut_changes - num_created_shots,
+                "- One Shot had its cut information updated. <br>",
+                "- %d Shots had their cut information updated. <br>",
+            ),
+        )
 
-        num_cut_updates = num_cut_changes - num_created_shots
-        if num_cut_updates == 1:
-            comments += "- One Shot had its cut information updated. <br>"
-        elif num_cut_updates > 1:
-            comments += (
-                "- %d Shots had their cut information updated. <br>" % num_cut_updates
-            )
+        comments = [
+            "Your export has been pushed to the Backburner queue for processing.<br><br>"
+        ]
+        for (count, singular_message, plural_message) in summary_items:
+            if count == 1:
+                comments.append(singular_message)
+            elif count > 1:
+                comments.append(plural_message % count)
 
         self.engine.show_modal(
-            "Submission Complete", self, dialogs.SubmissionCompleteDialog, comments
+            "Submission Complete",
+            self,
+            self._dialogs.SubmissionCompleteDialog,
+            "".join(comments),
         )
 
     ##############################################################################################################
@@ -793,20 +912,44 @@ class FlameExport(Application):
         render_path = os.path.join(info.get("exportPath"), info.get("resolvedPath"))
         batch_path = info.get("setupResolvedPath")
 
-        # first check if the resolved paths match our templates in the settings. Otherwise ignore the export
-        self.log_debug(
-            "Checking if the render path '%s' is recognized by toolkit..." % render_path
-        )
-        self._batch_export_preset = (
-            self.export_preset_handler.get_preset_for_batch_render_path(render_path)
+        resolved = self._resolve_batch_render(render_path, batch_path)
+        if resolved is None:
+            return None
+
+        # looks like we understand these paths!
+        # store preset and context so we can pass them downstream to the submission method.
+        (self._batch_export_preset, self._batch_context) = resolved
+
+        # ok so this looks like one of our renders - check with the user if they want to submit to review!
+        # pop up a UI asking the user for description
+        (return_code, widget) = self.engine.show_modal(
+            "Send to Review", self, self._dialogs.BatchRenderDialog
         )
-        if self._batch_export_preset is None:
-            self.log_debug(
-                "This path does not appear to match any toolkit render paths. Ignoring."
-            )
+
+        if return_code != self._qt_gui.QDialog.Rejected:
+            # user wants review!
+            self._send_batch_render_to_review = True
+            self._user_comments = widget.get_comments()
+
+    def _resolve_batch_render(self, render_path, batch_path):
+        """
+        Checks if a batch render is recognized by toolkit and resolves
+        the export preset and context to use for it.
+
+        :param render_path: Path to the rendered frames
+        :param batch_path: Path to the batch setup
+        :returns: (ExportPreset, Context) tuple, None if the render isn't
+                  recognized by toolkit
+        """
+        if not batch_path:
+            # flame only writes a batch setup when versioning is enabled
+            self.log_debug("No batch setup was written for this render. Ignoring.")
             return None
 
-        batch_template = self.get_template("batch_template")
+        # first check if the resolved paths match our templates in the settings. Otherwise ignore the export
+        # the batch path is checked against the single batch template first, so that
+        # renders not driven by toolkit are rejected without scanning every export preset
+        batch_template = self._batch_template
         if not batch_template.validate(batch_path):
             self.log_debug(
                 "The path '%s' does not match the template '%s'. Ignoring."
@@ -814,6 +957,18 @@ class FlameExport(Application):
             )
             return None
 
+        self.log_debug(
+            "Checking if the render path '%s' is recognized by toolkit..." % render_path
+        )
+        export_preset = self.export_preset_handler.get_preset_for_batch_render_path(
+            render_path
+        )
+        if export_preset is None:
+            self.log_debug(
+                "This path does not appear to match any toolkit render paths. Ignoring."
+            )
+            return None
+
         # as a last check, extract the context for the batch path
         self.log_debug("Getting context from path '%s'" % batch_path)
         context = self.sgtk.context_from_path(batch_path)
@@ -823,25 +978,9 @@ class FlameExport(Application):
             self.log_debug(
                 "Could not establish a context from the batch path. Aborting."
             )
-            return
+            return None
 
-        # looks like we understand these paths!
-        # store context so we can pass it downstream to the submission method.
-        self._batch_context = context
-
-        # ok so this looks like one of our renders - check with the user if they want to submit to review!
-        from sgtk.platform.qt import QtGui
-
-        # pop up a UI asking the user for description
-        dialogs = self.import_module("dialogs")
-        (return_code, widget) = self.engine.show_modal(
-            "Send to Review", self, dialogs.BatchRenderDialog
-        )
-
-        if return_code != QtGui.QDialog.Rejected:
-            # user wants review!
-            self._send_batch_render_to_review = True
-            self._user_comments = widget.get_comments()
+        return (export_preset, context)
 
     def post_batch_render_sg_process(self, info):
         """
@@ -895,14 +1034,19 @@ class FlameExport(Application):
 
         version_number = int(info["versionNumber"])
         description = self._user_comments or "Automatic Flame batch render"
-        export_preset_obj = self.export_preset_handler.get_preset_by_name(
-            self._batch_export_preset.get_name()
+        batch_context = self._batch_context
+        batch_path = info.get("setupResolvedPath")
+        full_flame_batch_render_path = os.path.join(
+            info.get("exportPath"), info.get("resolvedPath")
         )
 
+        # the preset was resolved by the export preset handler in the pre-batch render hook
+        export_preset_obj = self._batch_export_preset
+        export_preset_name = export_preset_obj.get_name()
+
         # first register the batch file as a publish in Flow Production Tracking
-        batch_path = info.get("setupResolvedPath")
         sg_batch_data = self._sg_submit_helper.register_batch_publish(
-            self._batch_context, batch_path, description, version_number
+            batch_context, batch_path, description, version_number
         )
 
         try:
@@ -911,13 +1055,9 @@ class FlameExport(Application):
             )
 
             # Now register the rendered images as a published plate in Flow Production Tracking
-            full_flame_batch_render_path = os.path.join(
-                info.get("exportPath"), info.get("resolvedPath")
-            )
-
             sg_data = self._sg_submit_helper.register_video_publish(
-                export_preset_obj.get_name(),
-                self._batch_context,
+                export_preset_name,
+                batch_context,
                 info["width"],
                 info["height"],
                 full_flame_batch_render_path,
@@ -935,7 +1075,7 @@ class FlameExport(Application):
             # only do this if the user clicked "send to review" in the UI.
             if self._send_batch_render_to_review:
                 sg_version_data = self._sg_submit_helper.create_version(
-                    self._batch_context,
+                    batch_context,
                     full_flame_batch_render_path,
                     description,
                     sg_data,
@@ -950,7 +1090,7 @@ class FlameExport(Application):
                         "Updating local quicktime...",
                     )
                     self.engine.trancoder.trancoder(
-                        display_name=export_preset_obj.get_name(),
+                        display_name=export_preset_name,
                         path=full_flame_batch_render_path,
                         target_entities=target_entities,
                         asset_info=info,
@@ -960,7 +1100,7 @@ class FlameExport(Application):
                 "Updating Flow Production Tracking...", "Updating thumbnails..."
             )
             self.engine.thumbnail_generator.generate(
-                display_name=export_preset_obj.get_name(),
+                display_name=export_preset_name,
                 path=full_flame_batch_render_path,
                 dependencies=None,
                 target_entities=target_entities,
@@ -8,7 +8,6 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import sgtk
 from sgtk.platform.qt import QtGui
 
 from .ui.batch_render_dialog import Ui_BatchRenderDialog
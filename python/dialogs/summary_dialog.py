@@ -8,8 +8,6 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import sys
-
 from sgtk.platform.qt import QtGui
 
 from .ui.submission_complete_dialog import Ui_SubmissionCompleteDialog
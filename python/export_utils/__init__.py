@@ -9,7 +9,7 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 
-from .shotgun_submit import ShotgunSubmitter
+from .shotgun_submit import ShotgunSubmitter, batch
 from .export_preset import ExportPresetHandler, ExportPreset
 from .sequence import Sequence
 from .shot import Shot
@@ -12,9 +12,13 @@ import sgtk
 from sgtk import TankError
 import pprint
 import os
+import re
 
 from html import escape
 
+# a substitution token in the export preset xml, e.g. "{FRAME_HANDLES}"
+XML_TOKEN_REGEX = re.compile(r"\{([A-Z_]+)\}")
+
 
 class ExportPreset(object):
     """
@@ -29,6 +33,8 @@ class ExportPreset(object):
         """
         self._app = sgtk.platform.current_bundle()
         self._raw_preset = raw_preset
+        # template objects resolved so far, keyed by preset setting name
+        self._templates = {}
 
     def __repr__(self):
         return "<ExportPreset %r>" % self._raw_preset
@@ -57,6 +63,24 @@ class ExportPreset(object):
 
         return publish_name
 
+    def __get_template(self, setting_name):
+        """
+        Returns the template object for a template name setting in this preset.
+        Templates are resolved on first access and then cached.
+
+        :param setting_name: Name of the preset setting holding the template name
+        :returns: Template object, None if the setting is empty
+        """
+        if setting_name not in self._templates:
+            template_name = self._raw_preset[setting_name]
+            if template_name:
+                self._templates[setting_name] = self._app.get_template_by_name(
+                    template_name
+                )
+            else:
+                self._templates[setting_name] = None
+        return self._templates[setting_name]
+
     def get_name(self):
         """
         :returns: The name of this export preset
@@ -70,8 +94,7 @@ class ExportPreset(object):
         """
         :returns: The render template object for this preset
         """
-        render_template_name = self._raw_preset["template"]
-        return self._app.get_template_by_name(render_template_name)
+        return self.__get_template("template")
 
     def get_batch_render_template(self):
         """
@@ -99,10 +122,10 @@ class ExportPreset(object):
             # If the batch render template is none, fall back on the
             # std plate render template
 
-            batch_render_template_name = self._raw_preset["batch_render_template"]
+            batch_render_template = self.__get_template("batch_render_template")
 
-            if batch_render_template_name:
-                return self._app.get_template_by_name(batch_render_template_name)
+            if batch_render_template:
+                return batch_render_template
 
             self._app.log_debug(
                 "batch_render_template not defined for %s - "
@@ -173,20 +196,14 @@ class ExportPreset(object):
         :returns: The template for quicktimes on disk,
                   None if no quicktimes should be written
         """
-        quicktime_template_name = self._raw_preset["quicktime_template"]
-        if quicktime_template_name:
-            return self._app.get_template_by_name(quicktime_template_name)
-        return None
+        return self.__get_template("quicktime_template")
 
     def get_batch_quicktime_template(self):
         """
         :returns: The template for batch render quicktimes on disk,
                   None if no quicktimes should be written
         """
-        batch_quicktime_template_name = self._raw_preset["batch_quicktime_template"]
-        if batch_quicktime_template_name:
-            return self._app.get_template_by_name(batch_quicktime_template_name)
-        return None
+        return self.__get_template("batch_quicktime_template")
 
     def batch_quicktime_path_from_render_path(self, batch_render_path):
         """
@@ -362,30 +379,26 @@ class ExportPreset(object):
             % preset_version
         )
 
-        # wedge in the video settings we got from the hook
+        # wedge in the video settings we got from the hook. This is done before
+        # the other substitutions, as the video settings may contain tokens too.
         xml = xml.replace("{VIDEO_EXPORT_PRESET}", video_preset_xml)
 
-        # and simple data type settings
-        xml = xml.replace("{FRAME_HANDLES}", str(self._raw_preset["frame_handles"]))
-
-        # now perform substitutions based on the rest of the resolved Flame templates
-        # make sure we escape any < and > before we add them to the xml
-        xml = xml.replace(
-            "{SEGMENT_CLIP_NAME_PATTERN}",
-            escape(resolved_flame_templates["segment_clip_template"]),
-        )
-        xml = xml.replace(
-            "{BATCH_NAME_PATTERN}",
-            escape(resolved_flame_templates["batch_template"]),
-        )
-        xml = xml.replace(
-            "{SHOT_CLIP_NAME_PATTERN}",
-            escape(resolved_flame_templates["shot_clip_template"]),
-        )
-        xml = xml.replace(
-            "{OUTPUT_PATH_PATTERN}",
-            escape(resolved_flame_templates["batch_render_template"]),
-        )
+        xml_values = {
+            # simple data type settings
+            "FRAME_HANDLES": str(self._raw_preset["frame_handles"]),
+            # now perform substitutions based on the rest of the resolved Flame templates
+            # make sure we escape any < and > before we add them to the xml
+            "SEGMENT_CLIP_NAME_PATTERN": escape(
+                resolved_flame_templates["segment_clip_template"]
+            ),
+            "BATCH_NAME_PATTERN": escape(resolved_flame_templates["batch_template"]),
+            "SHOT_CLIP_NAME_PATTERN": escape(
+                resolved_flame_templates["shot_clip_template"]
+            ),
+            "OUTPUT_PATH_PATTERN": escape(
+                resolved_flame_templates["batch_render_template"]
+            ),
+        }
 
         # now adjust some parameters in the export xml based on the template setup.
         template = self.get_render_template()
@@ -411,14 +424,14 @@ class ExportPreset(object):
             sequence_key = template.keys.get(frame_token)
 
         frame_padding = get_padding_from_key(key=sequence_key, default="4")
-        xml = xml.replace("{FRAME_PADDING}", frame_padding)
+        xml_values["FRAME_PADDING"] = frame_padding
         self._app.log_debug(
             "Flame preset generation: Setting frame padding to %s based on "
             "%s token in template %s" % (frame_padding, frame_token, template)
         )
 
         use_timecode = str(self._raw_preset.get("use_timecode_as_frame_number", True))
-        xml = xml.replace("{USE_TIMECODE}", str(use_timecode))
+        xml_values["USE_TIMECODE"] = use_timecode
         self._app.log_debug(
             "Flame preset generation: Setting use timecode to %s based on "
             "%s token in template %s" % (use_timecode, frame_token, template)
@@ -427,12 +440,17 @@ class ExportPreset(object):
         # Align the padding for versions with the definition in the version template
         version_key = template.keys.get("version")
         vesion_padding = get_padding_from_key(key=version_key, default="3")
-        xml = xml.replace("{VERSION_PADDING}", vesion_padding)
+        xml_values["VERSION_PADDING"] = vesion_padding
         self._app.log_debug(
             "Flame preset generation: Setting version padding to %s based on "
             "version token in template %s" % (vesion_padding, template)
         )
 
+        # substitute all remaining tokens in a single pass over the xml
+        xml = XML_TOKEN_REGEX.sub(
+            lambda match: xml_values.get(match.group(1), match.group(0)), xml
+        )
+
         # write it to disk
         preset_path = self.__write_content_to_file(xml, "export_preset.xml")
 
@@ -457,18 +475,21 @@ class ExportPreset(object):
         file_path = os.path.join(
             self._app.cache_location, self._app.instance_name, file_name
         )
-        folder = os.path.dirname(file_path)
 
-        # create folders
-        if not os.path.exists(folder):
+        # the folder only needs creating the first time a file is written
+        try:
+            fh = open(file_path, "wb")
+        except FileNotFoundError:
             old_umask = os.umask(0)
-            os.makedirs(folder, 0o777)
-            os.umask(old_umask)
+            try:
+                os.makedirs(os.path.dirname(file_path), 0o777, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+            fh = open(file_path, "wb")
 
         # write data
-        fh = open(file_path, "wt")
-        fh.write(content)
-        fh.close()
+        with fh:
+            fh.write(content.encode("utf-8"))
 
         self._app.log_debug("Wrote temporary file '%s'" % file_path)
         return file_path
@@ -588,15 +609,16 @@ class ExportPresetHandler(object):
         """
         self._app = sgtk.platform.current_bundle()
 
-        raw_preset_data = self._app.get_setting("plate_presets")
-        self._app.log_debug(
-            "ExportPresetHandler loaded export preset data "
-            "from environment: %s" % pprint.pformat(raw_preset_data)
-        )
+        self._raw_preset_data = self._app.get_setting("plate_presets")
+        if self._app.debug_enabled:
+            self._app.log_debug(
+                "ExportPresetHandler loaded export preset data "
+                "from environment: %s" % pprint.pformat(self._raw_preset_data)
+            )
 
         # create export preset objects
         self._export_presets = {}
-        for raw_preset in raw_preset_data:
+        for raw_preset in self._raw_preset_data:
             preset_name = raw_preset["name"]
             self._export_presets[preset_name] = ExportPreset(raw_preset)
 
@@ -606,11 +628,9 @@ class ExportPresetHandler(object):
 
         :returns: list of export preset strings
         """
-        raw_preset_data = self._app.get_setting("plate_presets")
-
         preset_names = []
 
-        for raw_preset in raw_preset_data:
+        for raw_preset in self._raw_preset_data:
             preset_min_version = raw_preset.get("min_version", "0")
 
             if sgtk.platform.current_engine().is_version_less_than(preset_min_version):
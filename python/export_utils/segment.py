@@ -23,6 +23,16 @@ class Segment(object):
     https://knowledge.autodesk.com/search-result/caas/CloudHelp/cloudhelp/2017/ENU/Flame-API/files/GUID-8EE47B4F-16F0-41D6-97BB-1226C0BDCC45-htm.html
     """
 
+    __slots__ = (
+        "_app",
+        "_shot",
+        "_name",
+        "_flame_data",
+        "_render_path",
+        "_backburner_job_id",
+        "_shotgun_version_id",
+    )
+
     def __init__(self, parent, name):
         """
         Constructor
@@ -32,6 +42,10 @@ class Segment(object):
         self._shot = parent
         self._name = name
         self._flame_data = None
+        # render path composed from the flame data, computed on first access
+        self._render_path = None
+        # id of the backburner job rendering this segment, resolved with the flame data
+        self._backburner_job_id = None
 
         # associated Flow Production Tracking version
         self._shotgun_version_id = None
@@ -66,7 +80,7 @@ class Segment(object):
         """
         Returns the Flow Production Tracking id for the version associated with this segment, if there is one.
         """
-        if not self.has_shotgun_version:
+        if self._shotgun_version_id is None:
             raise TankError(
                 "Cannot get Flow Production Tracking version id for segment - no version associated!"
             )
@@ -81,7 +95,7 @@ class Segment(object):
         prompts the user, asking her/him if they want to override an existing file and they
         select 'no'
         """
-        return self.flame_data is not None
+        return self._flame_data is not None
 
     @property
     def render_version_number(self):
@@ -95,10 +109,12 @@ class Segment(object):
         """
         Return the export render path for this segment
         """
-        return os.path.join(
-            self._get_flame_property("destinationPath"),
-            self._get_flame_property("resolvedPath"),
-        )
+        if self._render_path is None:
+            self._render_path = os.path.join(
+                self._get_flame_property("destinationPath"),
+                self._get_flame_property("resolvedPath"),
+            )
+        return self._render_path
 
     @property
     def render_aspect_ratio(self):
@@ -112,10 +128,7 @@ class Segment(object):
         """
         Return the backburner job id associated with this segment or None if not defined.
         """
-        backburner_id = None
-        if self._get_flame_property("isBackground"):
-            backburner_id = self._get_flame_property("backgroundJobId")
-        return backburner_id
+        return self._backburner_job_id
 
     @property
     def render_width(self):
@@ -312,6 +325,11 @@ class Segment(object):
         :param value: Flame hook data dictionary for this segment.
         """
         self._flame_data = value
+        self._render_path = None
+
+        self._backburner_job_id = None
+        if value and value.get("isBackground"):
+            self._backburner_job_id = value.get("backgroundJobId")
 
     def set_shotgun_version_id(self, version_id):
         """
@@ -327,16 +345,16 @@ class Segment(object):
         :return: Flame property
         :raises: ValueError if not found
         """
-        if self.flame_data is None:
+        if self._flame_data is None:
             raise ValueError("No Flame metadata found for %s" % self)
 
-        if property_name not in self.flame_data:
+        if property_name not in self._flame_data:
             raise ValueError(
                 "Property '%s' not found in Flame metadata for %s"
                 % (property_name, self)
             )
 
-        return self.flame_data[property_name]
+        return self._flame_data[property_name]
 
     def _frames_to_timecode(self, total_frames, frame_rate, drop):
         """
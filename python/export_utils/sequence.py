@@ -12,6 +12,7 @@ import pprint
 import sgtk
 from sgtk import TankError
 from .shot import Shot
+from . import shotgun_submit
 
 
 class Sequence(object):
@@ -28,6 +29,8 @@ class Sequence(object):
         self._name = name
         self._shotgun_id = None
         self._shots = {}
+        # segments with an associated version, in the order the versions were assigned
+        self._versioned_segments = []
 
         self._app = sgtk.platform.current_bundle()
 
@@ -72,7 +75,19 @@ class Sequence(object):
         This property ensures that all shots returned contain segments
         and thus aren't just "empty wrappers" but contain cut data.
         """
-        return [shot for shot in self.shots if len(shot.segments) > 0]
+        return [shot for shot in self._shots.values() if shot.has_segments]
+
+    @property
+    def versioned_segments(self):
+        """
+        Segments associated with this sequence which have a
+        Flow Production Tracking version.
+
+        This list is populated by set_segment_version_id() and
+        saves iterating over all shots and segments when only
+        the versioned ones need processing.
+        """
+        return self._versioned_segments
 
     def add_shot(self, shot_name):
         """
@@ -96,7 +111,34 @@ class Sequence(object):
 
         return self._shots[shot_name]
 
-    def process_shotgun_shot_structure(self):
+    def _get_base_segments_in_cut_order(self):
+        """
+        Returns the shots with segments together with their base segments,
+        sorted in cut order.
+
+        The base segment of each shot is computed once and returned
+        alongside the shot, so that callers don't have to look it up again.
+
+        :returns: List of (shot, base_segment) tuples
+        """
+        shots_and_segments = [
+            (shot, shot.get_base_segment()) for shot in self.shots_with_segments
+        ]
+        shots_and_segments.sort(key=lambda item: item[1].edit_in_frame)
+        return shots_and_segments
+
+    def set_segment_version_id(self, segment, version_id):
+        """
+        Associates a Flow Production Tracking version with a segment
+        of this sequence.
+
+        :param segment: Segment object belonging to this sequence
+        :param version_id: version id as int
+        """
+        segment.set_shotgun_version_id(version_id)
+        self._versioned_segments.append(segment)
+
+    def process_shotgun_shot_structure(self, task_template_cache=None):
         """
         Processes and populates Flow Production Tracking and filesystem data.
 
@@ -105,6 +147,11 @@ class Sequence(object):
         - Populates Flow Production Tracking data for Sequence and Shot objects
         - Creates folders on disk for any new objects
         - Computes the context for all shot objects
+
+        :param task_template_cache: Optional dictionary of task template data keyed
+                                    by task template name. Pass the same dictionary
+                                    when processing several sequences in one export
+                                    to only look up each task template once.
         """
         self._app.log_debug(
             "Preparing export structure for %s %s and shots %s"
@@ -117,7 +164,9 @@ class Sequence(object):
 
         try:
             # find and create shots and sequence in Flow Production Tracking
-            self._ensure_sg_shot_structure()
+            self._ensure_sg_shot_structure(
+                {} if task_template_cache is None else task_template_cache
+            )
 
             # now get a list of all new shots
             new_shots = [shot for shot in self._shots.values() if shot.new_in_shotgun]
@@ -167,26 +216,18 @@ class Sequence(object):
         )
 
         shotgun_batch_items = []
+        debug_enabled = self._app.debug_enabled
 
-        # now sort in order
-        shots_in_cut_order = sorted(
-            self.shots_with_segments, key=lambda x: x.get_base_segment().edit_in_frame
-        )
-
-        for index, shot in enumerate(shots_in_cut_order):
-            # make cut order 1 based
-            cut_order = index + 1
-            # get full cut data
-            (sg_in, sg_out, sg_cut_order) = shot.get_sg_shot_in_out()
-
-            # we get the edit points in flame from the base layer
-            base_seg = shot.get_base_segment()
+        # now sort in order. we get the edit points in flame from the base layer
+        # and make the cut order 1 based
+        for cut_order, (shot, base_seg) in enumerate(
+            self._get_base_segments_in_cut_order(), 1
+        ):
+            cut_in_frame = base_seg.cut_in_frame
+            cut_out_frame = base_seg.cut_out_frame
 
-            if (
-                base_seg.cut_in_frame != sg_in
-                or base_seg.cut_out_frame != sg_out
-                or cut_order != sg_cut_order
-            ):
+            # compare with the full cut data in Flow Production Tracking
+            if (cut_in_frame, cut_out_frame, cut_order) != shot.get_sg_shot_in_out():
 
                 # note that at this point all shots are guaranteed to exist in Flow Production Tracking
                 # since they were created in the initial export step.
@@ -195,8 +236,8 @@ class Sequence(object):
                     "entity_type": "Shot",
                     "entity_id": shot.shotgun_id,
                     "data": {
-                        "sg_cut_in": base_seg.cut_in_frame,
-                        "sg_cut_out": base_seg.cut_out_frame,
+                        "sg_cut_in": cut_in_frame,
+                        "sg_cut_out": cut_out_frame,
                         "sg_head_in": base_seg.head_in_frame,
                         "sg_tail_out": base_seg.tail_out_frame,
                         "sg_cut_duration": base_seg.duration,
@@ -204,9 +245,10 @@ class Sequence(object):
                     },
                 }
 
-                self._app.log_debug(
-                    "Registering cut change: %s" % pprint.pformat(sg_cut_batch)
-                )
+                if debug_enabled:
+                    self._app.log_debug(
+                        "Registering cut change: %s" % pprint.pformat(sg_cut_batch)
+                    )
                 shotgun_batch_items.append(sg_cut_batch)
 
         return shotgun_batch_items
@@ -236,6 +278,15 @@ class Sequence(object):
             )
             return
 
+        # get the shots in cut order
+        shots_in_cut_order = self._get_base_segments_in_cut_order()
+
+        if not shots_in_cut_order:
+            # nothing was exported for this sequence, for example because the user
+            # chose not to overwrite existing files, so there is no cut to create.
+            self._app.log_debug("No exported segments found. Will not create a cut.")
+            return
+
         self._app.engine.show_busy(
             "Updating Flow Production Tracking...", "Creating Cut..."
         )
@@ -263,12 +314,6 @@ class Sequence(object):
                 "The cut revision number will be %s." % next_revision_number
             )
 
-            # get the shots in cut order
-            shots_in_cut_order = sorted(
-                self.shots_with_segments,
-                key=lambda x: x.get_base_segment().edit_in_frame,
-            )
-
             # first create a new cut
             sg_cut = sg.create(
                 "Cut",
@@ -281,31 +326,22 @@ class Sequence(object):
                     "revision_number": next_revision_number,
                     # get the fps for the entire sequence by pulling it from
                     # the first segment
-                    "fps": shots_in_cut_order[0].get_base_segment().sequence_fps,
+                    "fps": shots_in_cut_order[0][1].sequence_fps,
                     "duration": sum(
-                        [
-                            shot.get_base_segment().duration
-                            for shot in self.shots
-                            if shot.get_base_segment() is not None
-                        ]
+                        segment.duration for (_, segment) in shots_in_cut_order
                     ),
-                    "timecode_start_text": shots_in_cut_order[0]
-                    .get_base_segment()
-                    .edit_in_timecode,
-                    "timecode_end_text": shots_in_cut_order[-1]
-                    .get_base_segment()
-                    .edit_out_timecode,
+                    "timecode_start_text": shots_in_cut_order[0][1].edit_in_timecode,
+                    "timecode_end_text": shots_in_cut_order[-1][1].edit_out_timecode,
                 },
             )
 
-            # now create the cut items in a single batch call
+            # now create the cut items using batch calls. The project and cut
+            # links are the same for all items.
+            project = self._app.context.project
+            cut_link = {"id": sg_cut["id"], "type": sg_cut["type"]}
             sg_batch_data = []
-            for index, shot in enumerate(shots_in_cut_order):
-                # make cut order 1 based
-                cut_order = index + 1
-                # we are pulling most values from the base layer
-                segment = shot.get_base_segment()
-
+            # make cut order 1 based. we are pulling most values from the base layer
+            for cut_order, (shot, segment) in enumerate(shots_in_cut_order, 1):
                 version_link = None
                 if segment.has_shotgun_version:
                     version_link = {"id": segment.shotgun_version_id, "type": "Version"}
@@ -315,9 +351,9 @@ class Sequence(object):
                     "entity_type": "CutItem",
                     "data": {
                         "code": segment.name,
-                        "project": self._app.context.project,
+                        "project": project,
                         "shot": {"id": shot.shotgun_id, "type": "Shot"},
-                        "cut": {"id": sg_cut["id"], "type": sg_cut["type"]},
+                        "cut": cut_link,
                         "version": version_link,
                         "cut_item_in": segment.cut_in_frame,
                         "cut_item_out": segment.cut_out_frame,
@@ -334,14 +370,40 @@ class Sequence(object):
                 sg_batch_data.append(batch)
 
             self._app.log_debug("Executing sg batch command for cut items....")
-            sg.batch(sg_batch_data)
+            shotgun_submit.batch(sg_batch_data)
             self._app.log_debug("...done!")
 
         finally:
             # turn off UI prompt
             self._app.engine.clear_busy()
 
-    def _ensure_sg_shot_structure(self):
+    def _get_task_template(self, task_template_name, task_template_cache):
+        """
+        Returns the Flow Production Tracking task template with the given name.
+
+        :param task_template_name: Name of the task template
+        :param task_template_cache: Dictionary of task templates already looked up,
+                                    keyed by name. Updated by this method.
+        :raises: TankError if the task template does not exist
+        :returns: Flow Production Tracking task template dictionary
+        """
+        if task_template_name not in task_template_cache:
+            self._app.engine.show_busy(
+                "Preparing Flow Production Tracking...", "Loading task template..."
+            )
+            sg_task_template = self._app.shotgun.find_one(
+                "TaskTemplate", [["code", "is", task_template_name]]
+            )
+            if not sg_task_template:
+                raise TankError(
+                    "The task template '%s' does not exist in Flow Production Tracking!"
+                    % task_template_name
+                )
+            task_template_cache[task_template_name] = sg_task_template
+
+        return task_template_cache[task_template_name]
+
+    def _ensure_sg_shot_structure(self, task_template_cache):
         """
         Ensures that Shots and sequences exist in Flow Production Tracking.
 
@@ -349,6 +411,9 @@ class Sequence(object):
         and assign task templates.
 
         Flow Production Tracking Shot and Sequence data for objects will be populated.
+
+        :param task_template_cache: Dictionary of task templates already looked up,
+                                    keyed by name.
         """
         self._app.log_debug(
             "Ensuring sequence and shots exists in Flow Production Tracking..."
@@ -391,17 +456,9 @@ class Sequence(object):
             # First see if we should assign a task template
             if parent_task_template:
                 # resolve task template
-                self._app.engine.show_busy(
-                    "Preparing Flow Production Tracking...", "Loading task template..."
-                )
-                sg_task_template = self._app.shotgun.find_one(
-                    "TaskTemplate", [["code", "is", parent_task_template]]
+                sg_task_template = self._get_task_template(
+                    parent_task_template, task_template_cache
                 )
-                if not sg_task_template:
-                    raise TankError(
-                        "The task template '%s' does not exist in Flow Production Tracking!"
-                        % parent_task_template
-                    )
             else:
                 sg_task_template = None
 
@@ -425,17 +482,9 @@ class Sequence(object):
         # Locate a task template for shots
         if shot_task_template:
             # resolve task template
-            self._app.engine.show_busy(
-                "Preparing Flow Production Tracking...", "Loading task template..."
+            sg_task_template = self._get_task_template(
+                shot_task_template, task_template_cache
             )
-            sg_task_template = self._app.shotgun.find_one(
-                "TaskTemplate", [["code", "is", shot_task_template]]
-            )
-            if not sg_task_template:
-                raise TankError(
-                    "The task template '%s' does not exist in Flow Production Tracking!"
-                    % shot_task_template
-                )
         else:
             sg_task_template = None
 
@@ -472,6 +521,7 @@ class Sequence(object):
 
         # create all shots that don't already exist
         sg_batch_data = []
+        debug_enabled = self._app.debug_enabled
         for shot in self._shots.values():
             if not shot.exists_in_shotgun:
                 # this shot does not yet exist in Flow Production Tracking
@@ -486,9 +536,10 @@ class Sequence(object):
                         "project": project,
                     },
                 }
-                self._app.log_debug(
-                    "Adding to Flow Production Tracking batch queue: %s" % batch
-                )
+                if debug_enabled:
+                    self._app.log_debug(
+                        "Adding to Flow Production Tracking batch queue: %s" % batch
+                    )
                 sg_batch_data.append(batch)
 
         if sg_batch_data:
@@ -497,17 +548,12 @@ class Sequence(object):
             )
 
             self._app.log_debug("Executing sg batch command....")
-            # We probably have to cut this into chunks
-            chunk_size = self._app.get_setting("upload_chunk_size")
-            sg_batch_response = []
-
-            def __chunks(sg_batch_data, chunk_size):
-                for i in range(0, len(sg_batch_data), chunk_size):
-                    yield sg_batch_data[i : i + chunk_size]
-
-            for sg_data_chunk in __chunks(sg_batch_data, chunk_size):
-                self._app.log_debug(pprint.pformat(sg_data_chunk))
-                sg_batch_response.extend(self._app.shotgun.batch(sg_data_chunk))
+            if debug_enabled:
+                self._app.log_debug(pprint.pformat(sg_batch_data))
+            # large requests are cut into chunks
+            sg_batch_response = shotgun_submit.batch(
+                sg_batch_data, self._app.get_setting("upload_chunk_size")
+            )
             self._app.log_debug("...done!")
 
             # register its data with Shot objects
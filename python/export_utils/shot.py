@@ -20,6 +20,22 @@ class Shot(object):
     Represents a Shot in Flame and Flow Production Tracking.
     """
 
+    __slots__ = (
+        "_app",
+        "_name",
+        "_parent",
+        "_created_this_session",
+        "_context",
+        "_shotgun_id",
+        "_sg_cut_in",
+        "_sg_cut_out",
+        "_sg_cut_order",
+        "_flame_batch_data",
+        "_batch_path",
+        "_segments",
+        "_template_fields",
+    )
+
     def __init__(self, parent, name):
         """
         Constructor
@@ -38,7 +54,11 @@ class Shot(object):
         self._sg_cut_out = None
         self._sg_cut_order = None
         self._flame_batch_data = None
+        # batch path composed from the flame batch data, computed on first access
+        self._batch_path = None
         self._segments = {}
+        # context based template fields, keyed by template
+        self._template_fields = {}
 
     def __repr__(self):
         return "<Shot %s, %s>" % (self._name, self._parent)
@@ -78,6 +98,13 @@ class Shot(object):
         """
         return list(self._segments.values())
 
+    @property
+    def has_segments(self):
+        """
+        Returns true if segments are associated with this shot
+        """
+        return len(self._segments) > 0
+
     @property
     def exists_in_shotgun(self):
         """
@@ -101,20 +128,22 @@ class Shot(object):
         """
         Return the flame batch export path for this shot
         """
-        if not self.has_batch_export:
+        if self._flame_batch_data is None:
             raise TankError("Cannot get batch path - no batch metadata found!")
 
-        return os.path.join(
-            self._flame_batch_data.get("destinationPath"),
-            self._flame_batch_data.get("resolvedPath"),
-        )
+        if self._batch_path is None:
+            self._batch_path = os.path.join(
+                self._flame_batch_data.get("destinationPath"),
+                self._flame_batch_data.get("resolvedPath"),
+            )
+        return self._batch_path
 
     @property
     def batch_version_number(self):
         """
         Return the version number associated with the batch file
         """
-        if not self.has_batch_export:
+        if self._flame_batch_data is None:
             raise TankError("Cannot get batch path - no batch metadata found!")
 
         return int(self._flame_batch_data["versionNumber"])
@@ -139,9 +168,7 @@ class Shot(object):
         if len(self._segments) == 0:
             return None
 
-        return min(
-            list(self._segments.values()), key=lambda segment: segment.flame_track_id
-        )
+        return min(self._segments.values(), key=lambda segment: segment.flame_track_id)
 
     def get_sg_shot_in_out(self):
         """
@@ -186,6 +213,21 @@ class Shot(object):
         """
         self._app.log_debug("Caching context for %s" % self)
         self._context = self._app.sgtk.context_from_entity("Shot", self.shotgun_id)
+        self._template_fields = {}
+
+    def get_template_fields(self, template):
+        """
+        Returns the fields for the given template resolved from the context of this Shot.
+
+        Fields are resolved once per template and then cached. A copy is returned
+        so the caller is free to add further fields to it.
+
+        :param template: Template object to resolve fields for
+        :returns: Dictionary of template fields
+        """
+        if template not in self._template_fields:
+            self._template_fields[template] = self._context.as_template_fields(template)
+        return dict(self._template_fields[template])
 
     def add_segment(self, segment_name):
         """
@@ -205,3 +247,4 @@ class Shot(object):
         :param data: dictionary with data from flame
         """
         self._flame_batch_data = data
+        self._batch_path = None
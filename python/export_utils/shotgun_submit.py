@@ -14,6 +14,30 @@ from sgtk import TankError
 import os
 import re
 
+# maximum number of requests to send in a single batch call
+MAX_BATCH_SIZE = 500
+
+
+def batch(batch_items, chunk_size=None):
+    """
+    Executes a list of Flow Production Tracking batch requests.
+
+    Oversized requests are broken up into smaller batch calls to avoid
+    timeouts. Requests that fit within a single chunk are sent as one
+    batch call, so they are created all or nothing.
+
+    :param batch_items: List of batch request dictionaries
+    :param chunk_size: Maximum number of requests per batch call.
+                       Defaults to MAX_BATCH_SIZE.
+    :returns: List of results, in the same order as the requests
+    """
+    sg = sgtk.platform.current_bundle().shotgun
+    chunk_size = chunk_size or MAX_BATCH_SIZE
+    sg_batch_response = []
+    for i in range(0, len(batch_items), chunk_size):
+        sg_batch_response.extend(sg.batch(batch_items[i : i + chunk_size]))
+    return sg_batch_response
+
 
 class ShotgunSubmitter(object):
     """
@@ -38,6 +62,10 @@ class ShotgunSubmitter(object):
         """
         self._app = sgtk.platform.current_bundle()
 
+        # the published file entity type is a pipeline configuration setting
+        # which doesn't change during a session - resolve it on first use.
+        self._published_file_entity_type = None
+
     def register_batch_publish(self, context, path, comments, version_number):
         """
         Creates a publish record in Flow Production Tracking for a Flame batch file.
@@ -72,11 +100,13 @@ class ShotgunSubmitter(object):
             "published_file_type": publish_type,
         }
 
-        self._app.log_debug(
-            "Register publish in Flow Production Tracking: %s" % str(args)
-        )
+        if self._app.debug_enabled:
+            self._app.log_debug(
+                "Register publish in Flow Production Tracking: %s" % str(args)
+            )
         sg_publish_data = sgtk.util.register_publish(**args)
-        self._app.log_debug("Register complete: %s" % sg_publish_data)
+        if self._app.debug_enabled:
+            self._app.log_debug("Register complete: %s" % sg_publish_data)
         return sg_publish_data
 
     def register_video_publish(
@@ -131,11 +161,13 @@ class ShotgunSubmitter(object):
             "published_file_type": preset_obj.get_render_publish_type(),
         }
 
-        self._app.log_debug(
-            "Register render publish in Flow Production Tracking: %s" % str(args)
-        )
+        if self._app.debug_enabled:
+            self._app.log_debug(
+                "Register render publish in Flow Production Tracking: %s" % str(args)
+            )
         sg_publish_data = sgtk.util.register_publish(**args)
-        self._app.log_debug("Register complete: %s" % sg_publish_data)
+        if self._app.debug_enabled:
+            self._app.log_debug("Register complete: %s" % sg_publish_data)
 
         # return the sg data for the main publish
         return sg_publish_data
@@ -150,7 +182,7 @@ class ShotgunSubmitter(object):
         data = {}
 
         # link to the publish
-        if sgtk.util.get_published_file_entity_type(self._app.sgtk) == "PublishedFile":
+        if self._get_published_file_entity_type() == "PublishedFile":
             # client is using published file entity
             data["published_files"] = [sg_publish_data]
         else:
@@ -189,10 +221,11 @@ class ShotgunSubmitter(object):
             context, path, user_comments, sg_publish_data, aspect_ratio
         )
         sg_batch_payload.append(version_batch)
-        self._app.log_debug(
-            "Create version in Flow Production Tracking: %s"
-            % pprint.pformat(sg_batch_payload)
-        )
+        if self._app.debug_enabled:
+            self._app.log_debug(
+                "Create version in Flow Production Tracking: %s"
+                % pprint.pformat(sg_batch_payload)
+            )
         sg_data = self._app.shotgun.batch(sg_batch_payload)
         self._app.log_debug("...done!")
         return sg_data[0]
@@ -272,10 +305,7 @@ class ShotgunSubmitter(object):
 
         # link to the publish
         if sg_publish_data:
-            if (
-                sgtk.util.get_published_file_entity_type(self._app.sgtk)
-                == "PublishedFile"
-            ):
+            if self._get_published_file_entity_type() == "PublishedFile":
                 # client is using published file entity
                 batch_item["data"]["published_files"] = [sg_publish_data]
             else:
@@ -292,6 +322,19 @@ class ShotgunSubmitter(object):
 
         return batch_item
 
+    def _get_published_file_entity_type(self):
+        """
+        Returns the published file entity type used by the current
+        pipeline configuration. The value is cached after the first call.
+
+        :returns: "PublishedFile" or "TankPublishedFile"
+        """
+        if self._published_file_entity_type is None:
+            self._published_file_entity_type = sgtk.util.get_published_file_entity_type(
+                self._app.sgtk
+            )
+        return self._published_file_entity_type
+
     def __get_tk_path_from_flame_plate_path(self, flame_path):
         """
         Given a xxx.[1234-1234].exr style Flame plate path,